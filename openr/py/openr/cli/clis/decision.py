@@ -12,7 +12,6 @@ from __future__ import division
 
 import click
 
-from openr.cli.commands import decision
 from openr.cli.utils.utils import parse_nodes
 
 
@@ -46,6 +45,7 @@ class PathCli(object):
     def path(cli_opts, src, dst, max_hop):  # noqa: B902
         ''' path from src to dst '''
 
+        from openr.cli.commands import decision
         decision.PathCmd(cli_opts).run(src, dst, max_hop)
 
 
@@ -63,6 +63,7 @@ class DecisionRoutesCli(object):
     def routes(cli_opts, nodes, prefixes, json):  # noqa: B902
         ''' Request the routing table from Decision module '''
 
+        from openr.cli.commands import decision
         nodes = parse_nodes(cli_opts.host, nodes, cli_opts.lm_cmd_port)
         decision.DecisionRoutesCmd(cli_opts).run(nodes, prefixes, json)
 
@@ -79,6 +80,7 @@ class DecisionPrefixesCli(object):
     def prefixes(cli_opts, nodes, json):  # noqa: B902
         ''' show the prefixes from Decision module '''
 
+        from openr.cli.commands import decision
         nodes = parse_nodes(cli_opts.host, nodes, cli_opts.lm_cmd_port)
         decision.DecisionPrefixesCmd(cli_opts).run(nodes, json)
 
@@ -97,6 +99,7 @@ class DecisionAdjCli(object):
     def adj(cli_opts, nodes, bidir, json):  # noqa: B902
         ''' dump the link-state adjacencies from Decision module '''
 
+        from openr.cli.commands import decision
         nodes = parse_nodes(cli_opts.host, nodes, cli_opts.lm_cmd_port)
         decision.DecisionAdjCmd(cli_opts).run(nodes, bidir, json)
 
@@ -108,4 +111,5 @@ class DecisionValidateCli(object):
     def validate(cli_opts):  # noqa: B902
         ''' Check all prefix & adj dbs in Decision against that in KvStore '''
 
+        from openr.cli.commands import decision
         decision.DecisionValidateCmd(cli_opts).run()
@@ -12,8 +12,6 @@ from __future__ import division
 
 import click
 
-from openr.cli.commands import fib
-
 
 class FibCli(object):
     def __init__(self):
@@ -58,6 +56,7 @@ class FibRoutesCli(object):
     def routes(cli_opts, prefixes, json):  # noqa: B902
         ''' Request routing table of the current host '''
 
+        from openr.cli.commands import fib
         fib.FibRoutesCmd(cli_opts).run(prefixes, json)
 
 
@@ -68,6 +67,7 @@ class FibCountersCli(object):
     def counters(cli_opts):  # noqa: B902
         ''' Get various counters on fib agent '''
 
+        from openr.cli.commands import fib
         fib.FibCountersCmd(cli_opts).run()
 
 
@@ -80,6 +80,7 @@ class FibListRoutesCli(object):
     def list_routes(cli_opts, prefixes):  # noqa: B902
         ''' Get and print all the routes on fib agent '''
 
+        from openr.cli.commands import fib
         fib.FibListRoutesCmd(cli_opts).run(prefixes)
 
 
@@ -92,6 +93,7 @@ class FibAddRoutesCli(object):
     def add_routes(cli_opts, prefixes, nexthops):  # noqa: B902
         ''' Add new routes in FIB '''
 
+        from openr.cli.commands import fib
         fib.FibAddRoutesCmd(cli_opts).run(prefixes, nexthops)
 
 
@@ -103,6 +105,7 @@ class FibDelRoutesCli(object):
     def del_routes(cli_opts, prefixes):  # noqa: B902
         ''' Delete routes from FIB '''
 
+        from openr.cli.commands import fib
         fib.FibDelRoutesCmd(cli_opts).run(prefixes)
 
 
@@ -115,6 +118,7 @@ class FibSyncRoutesCli(object):
     def sync_routes(cli_opts, prefixes, nexthops):  # noqa: B902
         ''' Re-program FIB with specified routes. Delete all old ones '''
 
+        from openr.cli.commands import fib
         fib.FibSyncRoutesCmd(cli_opts).run(prefixes, nexthops)
 
 
@@ -125,6 +129,7 @@ class FibValidateRoutesCli(object):
     def validate(cli_opts):  # noqa: B902
         ''' Validator to check that all routes as computed by Decision '''
 
+        from openr.cli.commands import fib
         fib.FibValidateRoutesCmd(cli_opts).run(cli_opts)
 
 
@@ -137,6 +142,7 @@ class FibListRoutesLinuxCli(object):
     def list_routes_linux(cli_opts, prefixes):  # noqa: B902
         ''' List routes from linux kernel routing table '''
 
+        from openr.cli.commands import fib
         fib.FibListRoutesLinuxCmd(cli_opts).run(prefixes)
 
 
@@ -147,4 +153,5 @@ class FibValidateRoutesLinuxCli(object):
     def validate_linux(cli_opts):  # noqa: B902
         ''' Validate that FIB routes and Kernel routes match '''
 
+        from openr.cli.commands import fib
         fib.FibValidateRoutesLinuxCmd().run(cli_opts)
@@ -13,8 +13,6 @@ from __future__ import division
 import click
 import sys
 
-from openr.cli.commands.tech_support import TechSupportCmd
-
 
 class TechSupportCli(object):
 
@@ -33,6 +31,8 @@ class TechSupportCli(object):
         - Recent perf events
         '''
 
+        from openr.cli.commands.tech_support import TechSupportCmd
+
         if fib_agent_port:
             ctx.obj.fib_agent_port = fib_agent_port
 
@@ -27,11 +27,10 @@ class ConfigCmd():
     def __init__(self, cli_opts):
         ''' initialize the Config Store client '''
 
-        self.client = config_store_client.ConfigStoreClient(
-            cli_opts.zmq_ctx,
-            cli_opts.config_store_url,
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.client = utils.get_shared_client(
+            cli_opts,
+            config_store_client.ConfigStoreClient,
+            cli_opts.config_store_url)
 
 
 class ConfigPrefixAllocatorCmd(ConfigCmd):
@@ -13,15 +13,32 @@ from __future__ import division
 from openr.clients import decision_client, kvstore_client
 from openr.cli.utils import utils
 from openr.utils import printing
-from openr.utils.serializer import deserialize_thrift_object
+from openr.utils.prefix_trie import PrefixTrie, addr_to_int, prefix_mask
+from openr.utils.serializer import deserialize_thrift_object_cached
 from openr.Lsdb import ttypes as lsdb_types
 from openr.utils.consts import Consts
 
 from collections import defaultdict
-from ipaddr import IPAddress, IPNetwork
+from concurrent.futures import ThreadPoolExecutor
+import socket
 import sys
 
 
+# v6 netmasks indexed by prefix length
+_V6_PREFIX_MASKS = [prefix_mask(prefix_len) for prefix_len in range(129)]
+
+# binary addr -> string, the same nexthop addrs repeat across adj and route dbs
+_sprint_addr_cache = {}
+
+
+def _sprint_addr(addr):
+    ''' memoized utils.sprint_addr '''
+
+    if addr not in _sprint_addr_cache:
+        _sprint_addr_cache[addr] = utils.sprint_addr(addr)
+    return _sprint_addr_cache[addr]
+
+
 class DecisionCmd(object):
     def __init__(self, cli_opts):
         ''' initialize the Decision client '''
@@ -32,32 +49,53 @@ class DecisionCmd(object):
         self.kv_rep_port = cli_opts.kv_rep_port
         self.fib_agent_port = cli_opts.fib_agent_port
         self.enable_color = cli_opts.enable_color
-
-        self.client = decision_client.DecisionClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.decision_rep_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
-        self.kvstore_client = kvstore_client.KvStoreClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.kv_rep_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.cli_opts = cli_opts
+        self.decision_url = "tcp://[{}]:{}".format(cli_opts.host,
+                                                   cli_opts.decision_rep_port)
+
+        # Reuse clients of earlier commands in this process, e.g. tech-support
+        self.client = utils.get_shared_client(
+            cli_opts, decision_client.DecisionClient, self.decision_url)
+        self.kvstore_client = utils.get_shared_client(
+            cli_opts,
+            kvstore_client.KvStoreClient,
+            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.kv_rep_port))
 
     def iter_dbs(self, container, dbs, nodes, parse_func):
         ''' parse prefix databases from decision module
 
             :container: container to store the generated data
             :dbs decision_types.PrefixDbs or decision_types.AdjDbs
-            :nodes set: the set of nodes for parsing
+            :nodes set: the set of nodes for parsing, dbs are not visited in
+                        any particular order
             :parse_func function: the parsing function
         '''
 
-        for (node, db) in sorted(dbs.items()):
-            if 'all' not in nodes and node not in nodes:
-                continue
+        if 'all' in nodes:
+            selected_dbs = dbs.values()
+        else:
+            selected_dbs = (dbs[node] for node in nodes if node in dbs)
+
+        for db in selected_dbs:
             parse_func(container, db)
 
+    def get_snapshot(self):
+        ''' get the LSDB from Decision
+
+            :return tuple: decision_types.AdjDbs, decision_types.PrefixDbs
+        '''
+
+        return self.client.get_adj_dbs(), self.client.get_prefix_dbs()
+
+
+class DecisionSnapshotCmd(DecisionCmd):
+    def run(self):
+        ''' get the LSDB from Decision once for several commands, which take
+            it as their snapshot argument
+        '''
+
+        return self.get_snapshot()
+
 
 class DecisionPrefixesCmd(DecisionCmd):
     def run(self, nodes, json):
@@ -69,29 +107,55 @@ class DecisionPrefixesCmd(DecisionCmd):
 
 
 class DecisionRoutesCmd(DecisionCmd):
-    def run(self, nodes, prefixes, json):
+    def run(self, nodes, prefixes, json, snapshot=None):
         if 'all' in nodes:
-            nodes = self._get_all_nodes()
+            nodes = self._get_all_nodes(snapshot)
+        route_dbs = self._fetch_route_dbs(nodes)
         if json:
             route_db_dict = {}
             for node in nodes:
-                route_db = self.client.get_route_db(node)
-                route_db_dict[node] = utils.route_db_to_dict(route_db)
+                route_db_dict[node] = utils.route_db_to_dict(route_dbs[node])
             utils.print_routes_json(route_db_dict, prefixes)
         else:
             for node in nodes:
-                route_db = self.client.get_route_db(node)
-                utils.print_routes_table(route_db, prefixes)
+                utils.print_routes_table(route_dbs[node], prefixes)
+
+    def _fetch_route_dbs(self, nodes):
+        ''' fetch the route dbs of nodes from Decision, concurrently if there
+            are several. zmq REQ sockets are not thread safe, so every worker
+            uses its thread's shared client.
+
+            :return dict: map from node name to its route db
+        '''
+
+        nodes = list(nodes)
+        if len(nodes) <= 1:
+            return {node: self.client.get_route_db(node) for node in nodes}
 
-    def _get_all_nodes(self):
-        ''' return all the nodes' name in the network '''
+        def _get_route_db(node):
+            client = utils.get_shared_client(
+                self.cli_opts, decision_client.DecisionClient,
+                self.decision_url)
+            return client.get_route_db(node)
 
-        def _parse(nodes, adj_db):
-            nodes.add(adj_db.thisNodeName)
+        with ThreadPoolExecutor(max_workers=min(32, len(nodes))) as executor:
+            return dict(zip(nodes, executor.map(_get_route_db, nodes)))
+
+    def _get_all_nodes(self, snapshot=None):
+        ''' return all the nodes' name in the network
+
+            :param snapshot: LSDB from DecisionSnapshotCmd, fetched if None
+        '''
+
+        def _parse(nodes, prefix_db):
+            nodes.add(prefix_db.thisNodeName)
 
         nodes = set()
-        adj_dbs = self.client.get_prefix_dbs()
-        self.iter_dbs(nodes, adj_dbs, ['all'], _parse)
+        if snapshot is None:
+            prefix_dbs = self.client.get_prefix_dbs()
+        else:
+            _, prefix_dbs = snapshot
+        self.iter_dbs(nodes, prefix_dbs, frozenset(['all']), _parse)
         return nodes
 
 
@@ -112,109 +176,132 @@ class PathCmd(DecisionCmd):
             src = src or host_id
             dst = dst or host_id
 
-        # Get prefix_dbs from KvStore
+        # Get prefix_dbs from KvStore, along with each node's v6 prefix entries
         self.prefix_dbs = {}
+        self._v6_entries = {}
         pub = self.kvstore_client.dump_all_with_prefix(Consts.PREFIX_DB_MARKER)
         for v in pub.keyVals.values():
-            prefix_db = deserialize_thrift_object(
+            prefix_db = deserialize_thrift_object_cached(
                 v.value, lsdb_types.PrefixDatabase)
             self.prefix_dbs[prefix_db.thisNodeName] = prefix_db
+            self._v6_entries[prefix_db.thisNodeName] = [
+                e for e in prefix_db.prefixEntries
+                if len(e.prefix.prefixAddress.addr) == 16]
+
+        # Per-run caches keyed by node name
+        self._route_db_cache = {}
+        self._route_tries = {}
+        self._node_prefixes_cache = {}
+        self._fib_table_cache = {}
 
         paths = self.get_paths(src, dst, max_hop)
         self.print_paths(paths)
 
-    def get_loopback_addr(self, node):
-        ''' get node's loopback addr'''
+        self._route_db_cache.clear()
+        self._route_tries.clear()
+        self._node_prefixes_cache.clear()
+        self._fib_table_cache.clear()
 
-        def _parse(loopback_set, prefix_db):
-            for prefix_entry in prefix_db.prefixEntries:
-                # Only consider v6 address
-                if len(prefix_entry.prefix.prefixAddress.addr) != 16:
-                    continue
+    def _route_db(self, node):
+        ''' get node's route db from Decision, fetched once per run '''
 
-                # Parse PrefixAllocator address
-                if prefix_entry.type == lsdb_types.PrefixType.PREFIX_ALLOCATOR:
-                    prefix = utils.sprint_prefix(prefix_entry.prefix)
-                    if prefix_entry.prefix.prefixLength == 128:
-                        prefix = prefix.split('/')[0]
-                    else:
-                        # TODO: we should ideally get address with last bit
-                        # set to 1. `python3.6 ipaddress` libraries does this
-                        # in one line. Alas no easy options with ipaddr
-                        # NOTE: In our current usecase we are just assuming
-                        # that allocated prefix has last 16 bits set to 0
-                        prefix = prefix.split('/')[0] + '1'
-                    loopback_set.add(prefix)
-                    continue
+        if node not in self._route_db_cache:
+            self._route_db_cache[node] = self.client.get_route_db(node)
+        return self._route_db_cache[node]
 
-                # Parse LOOPBACK address
-                if prefix_entry.type == lsdb_types.PrefixType.LOOPBACK:
-                    prefix = utils.sprint_prefix(prefix_entry.prefix)
-                    loopback_set.add(prefix.split('/')[0])
-                    continue
+    def get_loopback_addr(self, node):
+        ''' get node's loopback addr'''
 
         loopback_set = set()
-        self.iter_dbs(loopback_set, self.prefix_dbs, node, _parse)
+        for prefix_entry in self._v6_entries.get(node, []):
+            # Parse PrefixAllocator address
+            if prefix_entry.type == lsdb_types.PrefixType.PREFIX_ALLOCATOR:
+                addr = _sprint_addr(prefix_entry.prefix.prefixAddress.addr)
+                if prefix_entry.prefix.prefixLength != 128:
+                    # TODO: we should ideally get address with last bit
+                    # set to 1. `python3.6 ipaddress` libraries does this
+                    # in one line. Alas no easy options with ipaddr
+                    # NOTE: In our current usecase we are just assuming
+                    # that allocated prefix has last 16 bits set to 0
+                    addr = addr + '1'
+                loopback_set.add(addr)
+                continue
+
+            # Parse LOOPBACK address
+            if prefix_entry.type == lsdb_types.PrefixType.LOOPBACK:
+                loopback_set.add(
+                    _sprint_addr(prefix_entry.prefix.prefixAddress.addr))
+                continue
+
         return loopback_set.pop() if len(loopback_set) > 0 else None
 
     def get_node_prefixes(self, node):
+        ''' get node's v6 prefixes as (integer addr, prefix length) pairs,
+            parsed once per node '''
 
-        def _parse(prefix_set, prefix_db):
-            for prefix_entry in prefix_db.prefixEntries:
-                if len(prefix_entry.prefix.prefixAddress.addr) == 16:
-                    prefix_set.add(utils.sprint_prefix(prefix_entry.prefix))
-
-        prefix_set = set()
-        self.iter_dbs(prefix_set, self.prefix_dbs, node, _parse)
-        return prefix_set
+        if node not in self._node_prefixes_cache:
+            self._node_prefixes_cache[node] = set(
+                (addr_to_int(e.prefix.prefixAddress.addr),
+                 e.prefix.prefixLength)
+                for e in self._v6_entries.get(node, []))
+        return self._node_prefixes_cache[node]
 
     def get_if2node_map(self, adj_dbs):
-        ''' create a map from interface to node '''
+        ''' create a map from (node, interface, nexthop addr) to the
+            neighbor node '''
 
         def _parse(if2node, adj_db):
-            nexthop_dict = if2node[adj_db.thisNodeName]
+            node = adj_db.thisNodeName
             for adj in adj_db.adjacencies:
-                nh6_addr = utils.sprint_addr(adj.nextHopV6.addr)
-                nh4_addr = utils.sprint_addr(adj.nextHopV4.addr)
-                nexthop_dict[(adj.ifName, nh6_addr)] = adj.otherNodeName
-                nexthop_dict[(adj.ifName, nh4_addr)] = adj.otherNodeName
+                nh6_addr = _sprint_addr(adj.nextHopV6.addr)
+                nh4_addr = _sprint_addr(adj.nextHopV4.addr)
+                if2node[(node, adj.ifName, nh6_addr)] = adj.otherNodeName
+                if2node[(node, adj.ifName, nh4_addr)] = adj.otherNodeName
 
-        if2node = defaultdict(dict)
-        self.iter_dbs(if2node, adj_dbs, ["all"], _parse)
+        if2node = {}
+        self.iter_dbs(if2node, adj_dbs, frozenset(['all']), _parse)
         return if2node
 
     def get_lpm_route(self, route_db, dst_addr):
-        ''' find the routes to the longest prefix matches of dst. '''
-
-        max_prefix_len = -1
-        lpm_route = None
-        for route in route_db.routes:
-            if IPNetwork(utils.sprint_prefix(route.prefix)).Contains(
-                    IPAddress(dst_addr)):
-                next_hop_prefix_len = route.prefix.prefixLength
-                if next_hop_prefix_len == max_prefix_len:
+        ''' find the routes to the longest prefix matches of dst.
+
+            :param dst_addr: binary ip address of dst
+        '''
+
+        node = route_db.thisNodeName
+        if node not in self._route_tries:
+            trie = PrefixTrie()
+            for route in route_db.routes:
+                try:
+                    trie.insert(route.prefix.prefixAddress.addr,
+                                route.prefix.prefixLength, route)
+                except ValueError:
                     raise Exception('Duplicate prefix found in routing table {}'
                                     .format(utils.sprint_prefix(route.prefix)))
-                elif next_hop_prefix_len > max_prefix_len:
-                    lpm_route = route
-                    max_prefix_len = next_hop_prefix_len
+            self._route_tries[node] = trie
 
-        return lpm_route
+        return self._route_tries[node].search_best(dst_addr)
 
-    def get_lpm_len_from_node(self, node, dst_addr):
+    def get_lpm_len_by_node(self, dst_addr):
         '''
-        return the longest prefix match of dst_addr in node's
-        advertising prefix pool
+        return a map from each node to the longest prefix match of dst_addr
+        in the node's advertising prefix pool
         '''
 
-        cur_lpm_len = 0
-        for cur_prefix in self.get_node_prefixes(node):
-            if IPNetwork(cur_prefix).Contains(IPAddress(dst_addr)):
-                cur_len = int(cur_prefix.split('/')[1])
-                cur_lpm_len = max(cur_lpm_len, cur_len)
-        return cur_lpm_len
+        dst_int = addr_to_int(dst_addr)
+        lpm_len_by_node = {}
+        for node in self.prefix_dbs:
+            cur_lpm_len = 0
+            for addr_int, prefix_len in self.get_node_prefixes(node):
+                # only longer prefixes can improve the match
+                if prefix_len <= cur_lpm_len:
+                    continue
+                if (dst_int ^ addr_int) & _V6_PREFIX_MASKS[prefix_len] == 0:
+                    cur_lpm_len = prefix_len
+            lpm_len_by_node[node] = cur_lpm_len
+        return lpm_len_by_node
 
-    def get_nexthop_nodes(self, route_db, dst_addr, cur_lpm_len,
+    def get_nexthop_nodes(self, route_db, dst_bin_addr, cur_lpm_len,
                           if2node, fib_routes, in_fib):
         ''' get the next hop nodes.
         if the longest prefix is coming from the current node,
@@ -223,21 +310,22 @@ class PathCmd(DecisionCmd):
         next_hop_nodes = []
         is_initialized = fib_routes[route_db.thisNodeName]
 
-        lpm_route = self.get_lpm_route(route_db, dst_addr)
+        lpm_route = self.get_lpm_route(route_db, dst_bin_addr)
         if lpm_route and lpm_route.prefix.prefixLength >= cur_lpm_len:
             if in_fib and not is_initialized:
-                fib_routes[route_db.thisNodeName].extend(
-                    self.get_fib_path(
-                        route_db.thisNodeName,
-                        utils.sprint_prefix(lpm_route.prefix),
-                        self.fib_agent_port,
-                        self.timeout))
+                fib_nexthops = self.get_fib_path(
+                    route_db.thisNodeName,
+                    utils.sprint_prefix(lpm_route.prefix),
+                    self.fib_agent_port,
+                    self.timeout)
+                fib_routes[route_db.thisNodeName] = frozenset(
+                    (nh.ifName, _sprint_addr(nh.addr)) for nh in fib_nexthops)
             min_cost = min([p.metric for p in lpm_route.paths])
             for path in [p for p in lpm_route.paths if p.metric == min_cost]:
                 if len(path.nextHop.addr) == 16:
-                    nh_addr = utils.sprint_addr(path.nextHop.addr)
+                    nh_addr = _sprint_addr(path.nextHop.addr)
                     next_hop_node_name = \
-                        if2node[route_db.thisNodeName][(path.ifName, nh_addr)]
+                        if2node[(route_db.thisNodeName, path.ifName, nh_addr)]
                     next_hop_nodes.append([
                         next_hop_node_name,
                         path.ifName,
@@ -247,24 +335,28 @@ class PathCmd(DecisionCmd):
         return next_hop_nodes
 
     def get_fib_path(self, src, dst_prefix, fib_agent_port, timeout):
-        src_addr = self.get_loopback_addr(src)
-        if src_addr is None:
-            return []
-
-        try:
-            client = utils.get_fib_agent_client(
-                src_addr, fib_agent_port, timeout)
-            routes = client.getRouteTableByClient(client.client_id)
-        except Exception:
-            return []
-        for route in routes:
-            if utils.sprint_prefix(route.dest) == dst_prefix:
-                return route.nexthops
-        return []
+        table = self._fib_table_cache.get(src)
+        if table is None:
+            src_addr = self.get_loopback_addr(src)
+            if src_addr is None:
+                return []
+
+            try:
+                client = utils.get_fib_agent_client(
+                    src_addr, fib_agent_port, timeout)
+                routes = client.getRouteTableByClient(client.client_id)
+            except Exception:
+                routes = []
+            table = {utils.sprint_prefix(route.dest): route.nexthops
+                     for route in routes}
+            self._fib_table_cache[src] = table
+
+        return table.get(dst_prefix, [])
 
     def get_paths(self, src, dst, max_hop):
-        ''' calc paths from src to dst using backtracking. can add memoization to
-        convert to dynamic programming for better scalability when network is large.
+        ''' calc paths from src to dst using an iterative depth first search.
+        can add memoization to convert to dynamic programming for better
+        scalability when network is large.
         '''
 
         dst_addr = dst
@@ -272,25 +364,31 @@ class PathCmd(DecisionCmd):
         if ':' not in dst:
             dst_addr = self.get_loopback_addr(dst)
         try:
-            IPAddress(dst_addr)
-        except ValueError:
+            dst_bin_addr = utils.ip_str_to_addr(dst_addr).addr
+        except (socket.error, TypeError):
             print("node name or ip address not valid.")
             sys.exit(1)
+        lpm_len_by_node = self.get_lpm_len_by_node(dst_bin_addr)
 
         adj_dbs = self.client.get_adj_dbs()
         if2node = self.get_if2node_map(adj_dbs)
-        fib_routes = defaultdict(list)
+        # node -> set of (ifName, addr) of its fib nexthops towards dst
+        fib_routes = defaultdict(frozenset)
 
         paths = []
+        path = []
+        visited = set([src])
+        # frames of (node, hop, in_fib, iterator over the node's next hops)
+        stack = []
 
-        def _backtracking(cur, path, hop, visited, in_fib):
+        def _visit(cur, hop, in_fib):
             if hop > max_hop:
                 return
 
-            cur_lpm_len = self.get_lpm_len_from_node(cur, dst_addr)
+            cur_lpm_len = lpm_len_by_node.get(cur, 0)
             next_hop_nodes = self.get_nexthop_nodes(
-                self.client.get_route_db(cur),
-                dst_addr,
+                self._route_db(cur),
+                dst_bin_addr,
                 cur_lpm_len,
                 if2node,
                 fib_routes,
@@ -301,28 +399,31 @@ class PathCmd(DecisionCmd):
                     paths.append((in_fib, path[:]))
                 return
 
-            for next_hop_node in next_hop_nodes:
-                next_hop_node_name = next_hop_node[0]
-                # prevent loops
-                if next_hop_node_name in visited:
-                    return
+            stack.append((cur, hop, in_fib, iter(next_hop_nodes)))
+
+        _visit(src, 1, True)
+        while stack:
+            cur, hop, in_fib, next_hops = stack[-1]
+
+            # back out of the hop taken from this frame in the last round
+            if len(path) == hop:
+                visited.remove(path.pop()[1])
+
+            next_hop_node = next(next_hops, None)
+            # prevent loops
+            if next_hop_node is None or next_hop_node[0] in visited:
+                stack.pop()
+                continue
 
-                path.append([hop] + next_hop_node)
-                visited.add(next_hop_node_name)
+            path.append([hop] + next_hop_node)
+            visited.add(next_hop_node[0])
 
-                # check if next hop node is in fib path
-                is_nexthop_in_fib_path = False
-                for nexthop in fib_routes[cur]:
-                    if next_hop_node[3] == utils.sprint_addr(nexthop.addr) and\
-                            next_hop_node[1] == nexthop.ifName:
-                        is_nexthop_in_fib_path = True
+            # check if next hop node is in fib path
+            is_nexthop_in_fib_path = \
+                (next_hop_node[1], next_hop_node[3]) in fib_routes[cur]
 
-                _backtracking(next_hop_node_name, path, hop + 1, visited,
-                              is_nexthop_in_fib_path and in_fib)
-                visited.remove(next_hop_node_name)
-                path.pop()
+            _visit(next_hop_node[0], hop + 1, is_nexthop_in_fib_path and in_fib)
 
-        _backtracking(src, [], 1, set([src]), True)
         return paths
 
     def print_paths(self, paths):
@@ -344,22 +445,32 @@ class PathCmd(DecisionCmd):
 
 
 class DecisionValidateCmd(DecisionCmd):
-    def run(self):
+    def run(self, snapshot=None):
 
         print('Decision is in sync with KvStore if nothing shows up')
         print()
 
-        decision_adj_dbs, decision_prefix_dbs, kvstore_keyvals = self.get_dbs()
+        (decision_adj_dbs, decision_prefix_dbs,
+         kvstore_keyvals) = self.get_dbs(snapshot)
 
         kvstore_adj_node_names = set()
         kvstore_prefix_node_names = set()
 
+        # key marker -> (delta printer, kvstore node names, decision dbs)
+        options = {
+            Consts.ADJ_DB_MARKER: (self.print_adj_db_delta,
+                                   kvstore_adj_node_names, decision_adj_dbs),
+            Consts.PREFIX_DB_MARKER: (self.print_prefix_db_delta,
+                                      kvstore_prefix_node_names,
+                                      decision_prefix_dbs),
+        }
+
         for key, value in sorted(kvstore_keyvals.items()):
-            if (key.startswith(Consts.ADJ_DB_MARKER) or
-                    key.startswith(Consts.PREFIX_DB_MARKER)):
-                self.print_db_delta(key, value, kvstore_adj_node_names,
-                                    kvstore_prefix_node_names, decision_adj_dbs,
-                                    decision_prefix_dbs)
+            option = options.get(key[:key.find(':') + 1])
+            if option is None:
+                continue
+            print_delta, kvstore_node_names, decision_dbs = option
+            print_delta(value, kvstore_node_names, decision_dbs)
 
         decision_adj_node_names = set(decision_adj_dbs.keys())
         decision_prefix_node_names = set(decision_prefix_dbs.keys())
@@ -368,60 +479,58 @@ class DecisionValidateCmd(DecisionCmd):
         self.print_db_diff(decision_prefix_node_names, kvstore_prefix_node_names,
                            ['Decision', 'KvStore'], 'prefix')
 
-    def get_dbs(self):
+    def get_dbs(self, snapshot=None):
 
         # get LSDB from Decision
-        decision_adj_dbs = self.client.get_adj_dbs()
-        decision_prefix_dbs = self.client.get_prefix_dbs()
+        if snapshot is None:
+            snapshot = self.get_snapshot()
+        decision_adj_dbs, decision_prefix_dbs = snapshot
 
         # get LSDB from KvStore
         kvstore_keyvals = utils.dump_node_kvs(self.host, self.kv_rep_port).keyVals
 
         return decision_adj_dbs, decision_prefix_dbs, kvstore_keyvals
 
-    def print_db_delta(self, key, value, kvstore_adj_node_names,
-                       kvstore_prefix_node_names, decision_adj_dbs,
-                       decision_prefix_dbs):
-        if key.startswith(Consts.ADJ_DB_MARKER):
-            kvstore_adj_db = deserialize_thrift_object(value.value,
-                                                       lsdb_types.AdjacencyDatabase)
-            node_name = kvstore_adj_db.thisNodeName
-            kvstore_adj_node_names.add(node_name)
-            if node_name not in decision_adj_dbs:
-                print(printing.render_vertical_table(
-                    [["node {}'s adj db is missing in Decision".format(node_name)]]))
-                return
-            decision_adj_db = decision_adj_dbs[node_name]
-            lines = utils.sprint_adj_db_delta(kvstore_adj_db, decision_adj_db)
-            if lines:
-                print(printing.render_vertical_table(
-                      [["node {}'s adj db in Decision out of sync with KvStore's".
-                        format(node_name)]]))
-                print("\n".join(lines))
+    def print_adj_db_delta(self, value, kvstore_adj_node_names,
+                           decision_adj_dbs):
+        kvstore_adj_db = deserialize_thrift_object_cached(
+            value.value, lsdb_types.AdjacencyDatabase)
+        node_name = kvstore_adj_db.thisNodeName
+        kvstore_adj_node_names.add(node_name)
+        if node_name not in decision_adj_dbs:
+            print(printing.render_vertical_table(
+                [["node {}'s adj db is missing in Decision".format(node_name)]]))
             return
-
-        if key.startswith(Consts.PREFIX_DB_MARKER):
-            kvstore_prefix_db = deserialize_thrift_object(value.value,
-                                                          lsdb_types.PrefixDatabase)
-            node_name = kvstore_prefix_db.thisNodeName
-            kvstore_prefix_node_names.add(node_name)
-            if node_name not in decision_prefix_dbs:
-                print(printing.render_vertical_table(
-                      [["node {}'s prefix db is missing in Decision".
-                        format(node_name)]]))
-                return
-            decision_prefix_db = decision_prefix_dbs[node_name]
-            decision_prefix_set = {}
-            utils.update_global_prefix_db(
-                decision_prefix_set, decision_prefix_db)
-            lines = utils.sprint_prefixes_db_delta(
-                decision_prefix_set, kvstore_prefix_db)
-            if lines:
-                print(printing.render_vertical_table(
-                      [["node {}'s prefix db in Decision out of sync with KvStore's".
-                        format(node_name)]]))
-                print("\n".join(lines))
+        decision_adj_db = decision_adj_dbs[node_name]
+        lines = utils.sprint_adj_db_delta(kvstore_adj_db, decision_adj_db)
+        if lines:
+            print(printing.render_vertical_table(
+                  [["node {}'s adj db in Decision out of sync with KvStore's".
+                    format(node_name)]]))
+            print("\n".join(lines))
+
+    def print_prefix_db_delta(self, value, kvstore_prefix_node_names,
+                              decision_prefix_dbs):
+        kvstore_prefix_db = deserialize_thrift_object_cached(
+            value.value, lsdb_types.PrefixDatabase)
+        node_name = kvstore_prefix_db.thisNodeName
+        kvstore_prefix_node_names.add(node_name)
+        if node_name not in decision_prefix_dbs:
+            print(printing.render_vertical_table(
+                  [["node {}'s prefix db is missing in Decision".
+                    format(node_name)]]))
             return
+        decision_prefix_db = decision_prefix_dbs[node_name]
+        decision_prefix_set = {}
+        utils.update_global_prefix_db(
+            decision_prefix_set, decision_prefix_db)
+        lines = utils.sprint_prefixes_db_delta(
+            decision_prefix_set, kvstore_prefix_db)
+        if lines:
+            print(printing.render_vertical_table(
+                  [["node {}'s prefix db in Decision out of sync with KvStore's".
+                    format(node_name)]]))
+            print("\n".join(lines))
 
     def print_db_diff(self, nodes_set_a, nodes_set_b, db_sources, db_type):
         rows = []
@@ -192,11 +192,10 @@ class FibCmd(object):
 
         self.lm_cmd_port = cli_opts.lm_cmd_port
 
-        self.client = fib_client.FibClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.fib_rep_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.client = utils.get_shared_client(
+            cli_opts,
+            fib_client.FibClient,
+            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.fib_rep_port))
 
 
 class FibAgentCmd(object):
@@ -274,10 +273,24 @@ class FibCountersCmd(FibAgentCmd):
         print()
 
 
+class FibSnapshotCmd(FibAgentCmd):
+    def run(self):
+        ''' get the routes of this client from the Fib agent once for several
+            commands, which take them as their routes argument
+        '''
+
+        return self.client.getRouteTableByClient(self.client.client_id)
+
+
 class FibListRoutesCmd(FibAgentCmd):
-    def run(self, prefixes):
+    def run(self, prefixes, routes=None):
         try:
-            routes = self.client.getRouteTableByClient(self.client.client_id)
+            if routes is None:
+                routes = self.client.getRouteTableByClient(
+                    self.client.client_id)
+            elif isinstance(routes, Exception):
+                # FibSnapshotCmd failed to fetch them
+                raise routes
         except Exception as e:
             print('Failed to get routes from Fib.')
             print('Exception: {}'.format(e))
@@ -331,10 +344,15 @@ class FibSyncRoutesCmd(FibAgentCmd):
 
 
 class FibValidateRoutesCmd(FibAgentCmd):
-    def run(self, cli_opts):
+    def run(self, cli_opts, fib_routes=None):
         try:
+            if isinstance(fib_routes, Exception):
+                # FibSnapshotCmd failed to fetch them
+                raise fib_routes
             route_db = self.get_decision_route_db()
-            fib_routes = self.client.getRouteTableByClient(self.client.client_id)
+            if fib_routes is None:
+                fib_routes = self.client.getRouteTableByClient(
+                    self.client.client_id)
         except Exception as e:
             print('Failed to validate Fib routes.')
             print('Exception: {}'.format(e))
@@ -11,6 +11,7 @@ from __future__ import unicode_literals
 from __future__ import division
 
 import bunch
+import copy
 import datetime
 import hashlib
 import hexdump
@@ -55,11 +56,23 @@ class KvStoreCmd(object):
         self.lm_cmd_port = cli_opts.lm_cmd_port
         self.enable_color = cli_opts.enable_color
 
-        self.client = kvstore_client.KvStoreClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.kv_rep_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.client = utils.get_shared_client(
+            cli_opts,
+            kvstore_client.KvStoreClient,
+            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.kv_rep_port))
+
+    def dump_all_with_prefix(self, prefix, snapshot=None):
+        ''' dump the keys with prefix from KvStore
+
+            :param snapshot kv_store_types.Publication: full dump from
+                SnapshotCmd to take the keys from instead, if not None
+        '''
+
+        if snapshot is None:
+            return self.client.dump_all_with_prefix(prefix)
+        return kv_store_types.Publication({
+            key: value for key, value in snapshot.keyVals.items()
+            if key.startswith(prefix)})
 
     def iter_publication(self, container, publication, nodes, parse_func):
         ''' parse dumped publication
@@ -113,9 +126,18 @@ class KvStoreCmd(object):
         return None
 
 
+class SnapshotCmd(KvStoreCmd):
+    def run(self):
+        ''' dump the whole KvStore once for several commands, which take it
+            as their snapshot argument
+        '''
+
+        return self.client.dump_all_with_prefix('')
+
+
 class PrefixesCmd(KvStoreCmd):
-    def run(self, nodes, json):
-        resp = self.client.dump_all_with_prefix(Consts.PREFIX_DB_MARKER)
+    def run(self, nodes, json, snapshot=None):
+        resp = self.dump_all_with_prefix(Consts.PREFIX_DB_MARKER, snapshot)
         if json:
             utils.print_prefixes_json(resp, nodes, self.iter_publication)
         else:
@@ -123,8 +145,14 @@ class PrefixesCmd(KvStoreCmd):
 
 
 class KeysCmd(KvStoreCmd):
-    def run(self, json_fmt, prefix, ttl):
-        resp = self.client.dump_key_with_prefix(prefix)
+    def run(self, json_fmt, prefix, ttl, snapshot=None):
+        if snapshot is None:
+            resp = self.client.dump_key_with_prefix(prefix)
+        else:
+            resp = self.dump_all_with_prefix(prefix, snapshot)
+            # print_kvstore_keys drops the values, leave the snapshot's alone
+            resp.keyVals = {
+                key: copy.copy(value) for key, value in resp.keyVals.items()}
         self.print_kvstore_keys(resp, ttl, json_fmt)
 
     def print_kvstore_keys(self, resp, ttl, json_fmt):
@@ -223,8 +251,8 @@ class KeyValsCmd(KvStoreCmd):
 
 
 class NodesCmd(KvStoreCmd):
-    def run(self):
-        resp = self.client.dump_all_with_prefix(Consts.PREFIX_DB_MARKER)
+    def run(self, snapshot=None):
+        resp = self.dump_all_with_prefix(Consts.PREFIX_DB_MARKER, snapshot)
         host_id = utils.get_connected_node_name(self.host, self.lm_cmd_port)
         self.print_kvstore_nodes(resp, host_id)
 
@@ -260,8 +288,8 @@ class NodesCmd(KvStoreCmd):
 
 
 class AdjCmd(KvStoreCmd):
-    def run(self, nodes, bidir, json):
-        publication = self.client.dump_all_with_prefix(Consts.ADJ_DB_MARKER)
+    def run(self, nodes, bidir, json, snapshot=None):
+        publication = self.dump_all_with_prefix(Consts.ADJ_DB_MARKER, snapshot)
         adjs_map = utils.adj_dbs_to_dict(publication, nodes, bidir,
                                          self.iter_publication)
         if json:
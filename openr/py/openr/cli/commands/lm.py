@@ -22,11 +22,10 @@ class LMCmd(object):
     def __init__(self, cli_opts):
         ''' initialize the Link Monitor client '''
 
-        self.client = lm_client.LMClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.lm_cmd_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.client = utils.get_shared_client(
+            cli_opts,
+            lm_client.LMClient,
+            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.lm_cmd_port))
         self.enable_color = cli_opts.enable_color
 
 
@@ -30,11 +30,10 @@ class MonitorCmd(object):
         self.cli_opts = cli_opts
         self.monitor_pub_port = cli_opts.monitor_pub_port
 
-        self.client = monitor_client.MonitorClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.monitor_rep_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.client = utils.get_shared_client(
+            cli_opts,
+            monitor_client.MonitorClient,
+            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.monitor_rep_port))
 
 
 class CountersCmd(MonitorCmd):
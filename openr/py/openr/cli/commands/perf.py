@@ -11,6 +11,7 @@ from __future__ import unicode_literals
 from __future__ import division
 
 from openr.clients import perf_client
+from openr.cli.utils import utils
 
 import tabulate
 
@@ -19,11 +20,10 @@ class PerfCmd(object):
     def __init__(self, cli_opts):
         ''' initialize the Perf client '''
 
-        self.client = perf_client.PerfClient(
-            cli_opts.zmq_ctx,
-            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.fib_rep_port),
-            cli_opts.timeout,
-            cli_opts.proto_factory)
+        self.client = utils.get_shared_client(
+            cli_opts,
+            perf_client.PerfClient,
+            "tcp://[{}]:{}".format(cli_opts.host, cli_opts.fib_rep_port))
 
 
 class ViewFibCmd(PerfCmd):
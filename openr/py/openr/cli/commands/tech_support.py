@@ -10,13 +10,55 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 
+from concurrent.futures import ThreadPoolExecutor
+import bunch
 import os
-import subprocess
 import sys
+import threading
 
 from openr.utils.consts import Consts
 from openr.cli.commands import config, decision, fib, kvstore, lm, monitor
 from openr.cli.commands import perf, prefix_mgr
+from openr.cli.utils import utils
+
+
+class _ThreadOutput(object):
+    ''' stand-in for sys.stdout/sys.stderr which buffers the writes of threads
+        that started capturing and passes all other writes on to the stream.
+        sys.stdout is global, so redirecting it per thread isn't possible.
+    '''
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.chunks = []
+
+    def release(self):
+        ''' stop capturing and return the chunks written by this thread '''
+
+        chunks = self._local.chunks
+        del self._local.chunks
+        return chunks
+
+    def write(self, data):
+        # a text stream like sys.stdout, which click probes with write(b'')
+        # to decide whether to send it encoded bytes. bytes is str on py2.
+        if isinstance(data, bytes) and not isinstance(data, str):
+            raise TypeError('write() argument must be str, not bytes')
+        chunks = getattr(self._local, 'chunks', None)
+        if chunks is None:
+            self._stream.write(data)
+        else:
+            chunks.append(data)
+
+    def writelines(self, lines):
+        for data in lines:
+            self.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
 
 
 class TechSupportCmd():
@@ -24,110 +66,233 @@ class TechSupportCmd():
     def __init__(self, cli_opts):
         ''' initialize the tech support command '''
         self.cli_opts = cli_opts
-        # Keep short timeout
-        self.cli_opts.timeout = 1000
-        # Print routes or not
-        self.print_routes = False
+        # KvStore's dump, Decision's LSDB and Fib agent's routes, shared by
+        # the probes of a run: snapshot cmd class -> its result or the error
+        # fetching it
+        self._snapshots = {}
 
     def run(self, routes):
-        self.print_routes = routes
-        funcs = [
-            ('openr config file', self.print_config_file),
-            ('openr runtime params', self.print_runtime_params),
-            ('openr config', self.print_config),
-            ('breeze prefixmgr view', self.print_prefixmgr_view),
-            ('breeze lm links', self.print_lm_links),
-            ('breeze kvstore peers', self.print_kvstore_peers),
-            ('breeze kvstore nodes', self.print_kvstore_nodes),
-            ('breeze kvstore adj', self.print_kvstore_adjs),
-            ('breeze kvstore prefixes', self.print_kvstore_prefixes),
-            ('breeze kvstore keys --ttl', self.print_kvstore_keys),
-            ('breeze decision validate', self.print_decision_validate),
-            ('breeze decision routes', self.print_decision_routes),
-            ('breeze fib validate', self.print_fib_validate),
-            ('breeze fib routes', self.print_fib_routes),
-            ('breeze fib list', self.print_fib_list),
-            ('breeze perf fib', self.print_perf_fib),
-            ('breeze monitor counters', self.print_monitor_counters),
+        # (timeout in ms, probes). Probes of the same daemon run one after
+        # another on one thread, so they share the thread's client of that
+        # daemon. Groups dumping whole dbs get longer timeouts.
+        groups = [
+            (250, [('openr config file', self.print_config_file)]),
+            (250, [('openr runtime params', self.print_runtime_params)]),
+            (250, [('openr config', self.print_config)]),
+            (250, [('breeze prefixmgr view', self.print_prefixmgr_view)]),
+            (250, [('breeze lm links', self.print_lm_links)]),
+            (1500, [('breeze kvstore peers', self.print_kvstore_peers),
+                    ('breeze kvstore nodes', self.print_kvstore_nodes),
+                    ('breeze kvstore adj', self.print_kvstore_adjs),
+                    ('breeze kvstore prefixes', self.print_kvstore_prefixes),
+                    ('breeze kvstore keys --ttl', self.print_kvstore_keys)]),
+            (1500, [('breeze decision validate', self.print_decision_validate),
+                    ('breeze decision routes', self.print_decision_routes)]),
+            (1500, [('breeze fib validate', self.print_fib_validate),
+                    ('breeze fib routes', self.print_fib_routes),
+                    ('breeze fib list', self.print_fib_list),
+                    ('breeze perf fib', self.print_perf_fib)]),
+            (250, [('breeze monitor counters', self.print_monitor_counters)]),
         ]
+        if not routes:
+            route_funcs = [self.print_decision_routes, self.print_fib_routes,
+                           self.print_fib_list]
+            groups = [(timeout, [probe for probe in probes
+                                 if probe[1] not in route_funcs])
+                      for timeout, probes in groups]
         failures = []
-        for title, func in funcs:
-            self.print_title(title)
-            try:
-                func()
-            except Exception as e:
-                failures.append(title)
-                print(e, file=sys.stderr)
-        if failures:
-            self.print_title('openr-tech-support failures')
-            print('\n'.join(failures))
-        print()
+        # groups run with copies of cli_opts, which share the cached clients
+        self.cli_opts.setdefault('clients', {})
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = _ThreadOutput(stdout), _ThreadOutput(stderr)
+        # the whole report is buffered and written at once
+        sys.stdout.capture()
+        sys.stderr.capture()
+        try:
+            # groups are independent, run them all at once and add their
+            # buffered output in order
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                results = [executor.submit(self._run_group, probes, timeout)
+                           for timeout, probes in groups]
+                for (_, probes), result in zip(groups, results):
+                    titles = [title for title, _ in probes]
+                    for title, (out, err, error) in zip(titles,
+                                                        result.result()):
+                        self.print_title(title)
+                        sys.stdout.writelines(out)
+                        sys.stderr.writelines(err)
+                        if error is not None:
+                            failures.append(title)
+                            sys.stderr.write(title + ': ' + error + '\n')
+            if failures:
+                self.print_title('openr-tech-support failures', sys.stderr)
+                sys.stderr.write('\n'.join(failures) + '\n')
+            print()
+        finally:
+            out, err = sys.stdout.release(), sys.stderr.release()
+            sys.stdout, sys.stderr = stdout, stderr
+            utils.clear_shared_clients(self.cli_opts)
+            utils.clear_connected_node_names()
+            self._snapshots.clear()
+            stdout.write(''.join(out))
+            stdout.flush()
+            if err:
+                stderr.write(''.join(err))
         return -1 if failures else 0
 
-    def print_title(self, title):
-        print('\n--------  {}  --------\n'.format(title))
+    def _run_group(self, probes, timeout):
+        ''' run the funcs of probes in order with timeout in ms, capturing
+            their output
+
+            :return list: stdout chunks, stderr chunks, error message or None
+                          for each func
+        '''
+
+        cli_opts = bunch.Bunch(self.cli_opts)
+        cli_opts.timeout = timeout
+        return [self._run_captured(func, cli_opts) for _, func in probes]
+
+    def _run_captured(self, func, cli_opts):
+        ''' run func(cli_opts) capturing its output
+
+            :return tuple: stdout chunks, stderr chunks, error message or None
+        '''
 
-    def print_config_file(self):
+        sys.stdout.capture()
+        sys.stderr.capture()
+        error = None
+        try:
+            func(cli_opts)
+        except SystemExit as e:
+            # commands exit after printing why they failed
+            error = 'exit status {}'.format(e.code)
+        except Exception as e:
+            # errors may carry whole thrift objects, keep the message short
+            error = repr(e)[:512]
+        finally:
+            out, err = sys.stdout.release(), sys.stderr.release()
+        if error is not None:
+            # a REQ socket that timed out can't send again, drop this
+            # thread's clients and leave the other groups' alone
+            utils.clear_shared_clients(cli_opts, current_thread_only=True)
+        return out, err, error
+
+    def print_title(self, title, file=None):
+        (file or sys.stdout).write('\n--------  ' + title + '  --------\n\n')
+
+    def print_config_file(self, cli_opts):
         if not os.path.isfile(Consts.OPENR_CONFIG_FILE):
             print('Missing Config File')
             return
         with open(Consts.OPENR_CONFIG_FILE) as f:
             print(f.read())
 
-    def print_runtime_params(self):
-        output = subprocess.check_output(
-            ['pgrep', '-a', 'openr'], stderr=subprocess.STDOUT)
-        print(output)
+    def print_runtime_params(self, cli_opts):
+        # what `pgrep -a openr` prints, read from /proc instead of forking
+        procs = []
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                with open('/proc/{}/comm'.format(pid), 'rb') as f:
+                    comm = f.read().strip()
+                if b'openr' not in comm:
+                    continue
+                with open('/proc/{}/cmdline'.format(pid), 'rb') as f:
+                    cmdline = f.read().rstrip(b'\0').replace(b'\0', b' ')
+            except (IOError, OSError):
+                # the process is gone
+                continue
+            cmdline = (cmdline or comm).decode('utf-8', 'replace')
+            procs.append((int(pid), cmdline))
+        if not procs:
+            raise Exception('No openr process found')
+        for pid, cmdline in sorted(procs):
+            print('{} {}'.format(pid, cmdline))
 
-    def print_config(self):
-        config.ConfigPrefixAllocatorCmd(self.cli_opts).run()
-        config.ConfigLinkMonitorCmd(self.cli_opts).run()
-        config.ConfigPrefixManagerCmd(self.cli_opts).run()
+    def print_config(self, cli_opts):
+        config.ConfigPrefixAllocatorCmd(cli_opts).run()
+        config.ConfigLinkMonitorCmd(cli_opts).run()
+        config.ConfigPrefixManagerCmd(cli_opts).run()
 
-    def print_prefixmgr_view(self):
-        prefix_mgr.ViewCmd(self.cli_opts).run()
+    def print_prefixmgr_view(self, cli_opts):
+        prefix_mgr.ViewCmd(cli_opts).run()
 
-    def print_lm_links(self):
-        lm.LMLinksCmd(self.cli_opts).run(True, False)
+    def print_lm_links(self, cli_opts):
+        lm.LMLinksCmd(cli_opts).run(True, False)
 
-    def print_kvstore_peers(self):
-        kvstore.PeersCmd(self.cli_opts).run()
+    def print_kvstore_peers(self, cli_opts):
+        kvstore.PeersCmd(cli_opts).run()
 
-    def print_kvstore_nodes(self):
-        kvstore.NodesCmd(self.cli_opts).run()
+    def _get_kvstore_snapshot(self, cli_opts):
+        return self._get_snapshot(kvstore.SnapshotCmd, cli_opts)
 
-    def print_kvstore_adjs(self):
-        kvstore.AdjCmd(self.cli_opts).run(['all'], False, False)
+    def print_kvstore_nodes(self, cli_opts):
+        kvstore.NodesCmd(cli_opts).run(self._get_kvstore_snapshot(cli_opts))
 
-    def print_kvstore_prefixes(self):
-        kvstore.PrefixesCmd(self.cli_opts).run(['all'], False)
+    def print_kvstore_adjs(self, cli_opts):
+        kvstore.AdjCmd(cli_opts).run(['all'], False, False,
+                                     self._get_kvstore_snapshot(cli_opts))
 
-    def print_kvstore_keys(self):
-        kvstore.KeysCmd(self.cli_opts).run(False, '', True)
+    def print_kvstore_prefixes(self, cli_opts):
+        kvstore.PrefixesCmd(cli_opts).run(['all'], False,
+                                          self._get_kvstore_snapshot(cli_opts))
 
-    def print_decision_validate(self):
-        decision.DecisionValidateCmd(self.cli_opts).run()
+    def print_kvstore_keys(self, cli_opts):
+        kvstore.KeysCmd(cli_opts).run(False, '', True,
+                                      self._get_kvstore_snapshot(cli_opts))
 
-    def print_decision_routes(self):
-        if not self.print_routes:
-            return
-        decision.DecisionRoutesCmd(self.cli_opts).run(['all'], [], False)
+    def _get_decision_snapshot(self, cli_opts):
+        return self._get_snapshot(decision.DecisionSnapshotCmd, cli_opts)
 
-    def print_fib_validate(self):
-        fib.FibValidateRoutesCmd(self.cli_opts).run(self.cli_opts)
+    def print_decision_validate(self, cli_opts):
+        decision.DecisionValidateCmd(cli_opts).run(
+            self._get_decision_snapshot(cli_opts))
 
-    def print_fib_routes(self):
-        if not self.print_routes:
-            return
-        fib.FibRoutesCmd(self.cli_opts).run([], False)
+    def print_decision_routes(self, cli_opts):
+        decision.DecisionRoutesCmd(cli_opts).run(
+            ['all'], [], False, self._get_decision_snapshot(cli_opts))
 
-    def print_fib_list(self):
-        if not self.print_routes:
-            return
-        fib.FibListRoutesCmd(self.cli_opts).run([])
+    def _get_snapshot(self, snapshot_cmd, cli_opts):
+        ''' run snapshot_cmd once for the probes sharing its result. A failure
+            is remembered too, including a command exiting because it can't
+            connect, so the later probes fail the same way instead of timing
+            out again.
+        '''
+
+        if snapshot_cmd not in self._snapshots:
+            try:
+                self._snapshots[snapshot_cmd] = snapshot_cmd(cli_opts).run()
+            except (Exception, SystemExit) as e:
+                self._snapshots[snapshot_cmd] = e
+        snapshot = self._snapshots[snapshot_cmd]
+        if isinstance(snapshot, (Exception, SystemExit)):
+            raise snapshot
+        return snapshot
+
+    def _get_fib_snapshot(self, cli_opts):
+        ''' the fib routes, or the error fetching them for the fib commands
+            to report like their own fetch failing
+        '''
+
+        try:
+            return self._get_snapshot(fib.FibSnapshotCmd, cli_opts)
+        except Exception as e:
+            return e
+
+    def print_fib_validate(self, cli_opts):
+        routes = self._get_fib_snapshot(cli_opts)
+        fib.FibValidateRoutesCmd(cli_opts).run(cli_opts, routes)
+
+    def print_fib_routes(self, cli_opts):
+        fib.FibRoutesCmd(cli_opts).run([], False)
+
+    def print_fib_list(self, cli_opts):
+        routes = self._get_fib_snapshot(cli_opts)
+        fib.FibListRoutesCmd(cli_opts).run([], routes)
 
-    def print_perf_fib(self):
-        perf.ViewFibCmd(self.cli_opts).run()
+    def print_perf_fib(self, cli_opts):
+        perf.ViewFibCmd(cli_opts).run()
 
-    def print_monitor_counters(self):
-        monitor.CountersCmd(self.cli_opts).run()
+    def print_monitor_counters(self, cli_opts):
+        monitor.CountersCmd(cli_opts).run()
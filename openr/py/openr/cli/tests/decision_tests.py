@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+#
+# Copyright (c) 2014-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import division
+
+from openr.cli.commands import decision
+
+import unittest
+
+
+class DecisionClientStub(object):
+    def get_adj_dbs(self):
+        return {}
+
+
+class PathCmdStub(decision.PathCmd):
+    ''' PathCmd walking a graph of node -> [(next hop node, interface)]
+        instead of route dbs. fib maps a node to its (interface, addr)
+        next hops in the Fib.
+    '''
+
+    def __init__(self, graph, fib=None):
+        self.client = DecisionClientStub()
+        self.prefix_dbs = {}
+        self.graph = graph
+        self.fib = fib or {}
+
+    def _route_db(self, node):
+        return node
+
+    def get_nexthop_nodes(self, route_db, dst_bin_addr, cur_lpm_len,
+                          if2node, fib_routes, in_fib):
+        fib_routes[route_db] = frozenset(self.fib.get(route_db, []))
+        return [[node, if_name, 1, 'fe80::1']
+                for node, if_name in self.graph.get(route_db, [])]
+
+
+def hop(hop, node, if_name):
+    return [hop, node, if_name, 1, 'fe80::1']
+
+
+class TestPathCmd(unittest.TestCase):
+    def test_ecmp(self):
+        via_a = [hop(1, 'A', 'if_s_a'), hop(2, 'C', 'if_a_c'),
+                 hop(3, 'X', 'if_c_x')]
+        via_b = [hop(1, 'B', 'if_s_b'), hop(2, 'X', 'if_b_x')]
+        graph = {'A': [('C', 'if_a_c')], 'B': [('X', 'if_b_x')],
+                 'C': [('X', 'if_c_x')]}
+
+        # both paths whatever the order of S's next hops
+        graph['S'] = [('A', 'if_s_a'), ('B', 'if_s_b')]
+        self.assertEqual(PathCmdStub(graph).get_paths('S', 'fc00::1', 8),
+                         [(False, via_a), (False, via_b)])
+        graph['S'] = [('B', 'if_s_b'), ('A', 'if_s_a')]
+        self.assertEqual(PathCmdStub(graph).get_paths('S', 'fc00::1', 8),
+                         [(False, via_b), (False, via_a)])
+
+    def test_in_fib(self):
+        graph = {'S': [('A', 'if_s_a'), ('B', 'if_s_b')],
+                 'A': [('X', 'if_a_x')], 'B': [('X', 'if_b_x')]}
+        fib = {'S': [('if_s_a', 'fe80::1'), ('if_s_b', 'fe80::1')],
+               'A': [('if_a_x', 'fe80::1')]}
+
+        paths = PathCmdStub(graph, fib).get_paths('S', 'fc00::1', 8)
+
+        # B's next hop to X is missing from its Fib
+        self.assertEqual([in_fib for in_fib, _ in paths], [True, False])
+
+    def test_loop(self):
+        # a next hop back to a node on the path stops the search of its
+        # remaining siblings
+        graph = {'S': [('A', 'if_s_a')], 'B': [('X', 'if_b_x')]}
+
+        graph['A'] = [('B', 'if_a_b'), ('S', 'if_a_s')]
+        self.assertEqual(
+            PathCmdStub(graph).get_paths('S', 'fc00::1', 8),
+            [(False, [hop(1, 'A', 'if_s_a'), hop(2, 'B', 'if_a_b'),
+                      hop(3, 'X', 'if_b_x')])])
+        graph['A'] = [('S', 'if_a_s'), ('B', 'if_a_b')]
+        self.assertEqual(PathCmdStub(graph).get_paths('S', 'fc00::1', 8), [])
+
+    def test_max_hop(self):
+        graph = {'S': [('A', 'if_s_a')], 'A': [('B', 'if_a_b')],
+                 'B': [('X', 'if_b_x')]}
+
+        self.assertEqual(PathCmdStub(graph).get_paths('S', 'fc00::1', 3), [])
+        self.assertEqual(len(PathCmdStub(graph).get_paths('S', 'fc00::1', 4)),
+                         1)
+
+    def test_no_nexthops(self):
+        self.assertEqual(PathCmdStub({}).get_paths('S', 'fc00::1', 8), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
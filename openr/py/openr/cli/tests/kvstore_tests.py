@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+#
+# Copyright (c) 2014-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import division
+
+from openr.cli.commands import kvstore
+from openr.IpPrefix import ttypes as ip_types
+from openr.KvStore import ttypes as kv_store_types
+from openr.Lsdb import ttypes as lsdb_types
+from openr.utils.consts import Consts
+from openr.utils.serializer import serialize_thrift_object
+
+import bunch
+import socket
+import sys
+import unittest
+import zmq
+
+
+def binary_addr(addr_str):
+    family = socket.AF_INET6 if ':' in addr_str else socket.AF_INET
+    return ip_types.BinaryAddress(addr=socket.inet_pton(family, addr_str))
+
+
+def kv_value(thrift_obj):
+    return kv_store_types.Value(
+        version=1, originatorId='node1',
+        value=serialize_thrift_object(thrift_obj),
+        ttl=Consts.CONST_TTL_INF, ttlVersion=0, hash=1)
+
+
+prefix_db = lsdb_types.PrefixDatabase(
+    thisNodeName='node1',
+    prefixEntries=[lsdb_types.PrefixEntry(
+        prefix=ip_types.IpPrefix(prefixAddress=binary_addr('fc00:cafe::'),
+                                 prefixLength=64),
+        type=lsdb_types.PrefixType.LOOPBACK)])
+
+adj_db = lsdb_types.AdjacencyDatabase(
+    thisNodeName='node1', isOverloaded=False, nodeLabel=1,
+    adjacencies=[lsdb_types.Adjacency(
+        otherNodeName='node2', ifName='if_1_2', otherIfName='if_2_1',
+        nextHopV6=binary_addr('fe80::2'), nextHopV4=binary_addr('10.0.0.2'),
+        metric=1, adjLabel=0, isOverloaded=False, rtt=5, timestamp=0,
+        weight=1)])
+
+publication = kv_store_types.Publication({
+    Consts.PREFIX_DB_MARKER + 'node1': kv_value(prefix_db),
+    Consts.ADJ_DB_MARKER + 'node1': kv_value(adj_db)})
+
+
+class KvStoreClientStub(object):
+    ''' serves dumps of publication and records the requested prefixes '''
+
+    def __init__(self):
+        self.prefixes = []
+
+    def dump_all_with_prefix(self, prefix=''):
+        self.prefixes.append(prefix)
+        return kv_store_types.Publication({
+            key: value for key, value in publication.keyVals.items()
+            if key.startswith(prefix)})
+
+
+class Output(object):
+    ''' stand-in for sys.stdout collecting what the commands print '''
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return ''.join(self.chunks)
+
+
+class TestKvStoreCmds(unittest.TestCase):
+    def setUp(self):
+        self.cli_opts = bunch.Bunch({
+            'host': 'localhost',
+            'kv_pub_port': Consts.KVSTORE_PUB_PORT,
+            'kv_rep_port': Consts.KVSTORE_REP_PORT,
+            'lm_cmd_port': Consts.LINK_MONITOR_CMD_PORT,
+            'enable_color': False,
+            'timeout': Consts.TIMEOUT_MS,
+            'zmq_ctx': zmq.Context(),
+            'proto_factory': Consts.PROTO_FACTORY,
+        })
+        self.client = KvStoreClientStub()
+        self.stdout = sys.stdout
+        sys.stdout = Output()
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+
+    def make_cmd(self, cmd_type):
+        cmd = cmd_type(self.cli_opts)
+        cmd.client = self.client
+        return cmd
+
+    def test_prefixes(self):
+        self.make_cmd(kvstore.PrefixesCmd).run(['all'], False)
+        output = sys.stdout.getvalue()
+        self.assertIn("node1's prefixes", output)
+        self.assertIn('fc00:cafe::/64', output)
+        self.assertEqual(self.client.prefixes, [Consts.PREFIX_DB_MARKER])
+
+    def test_adj(self):
+        self.make_cmd(kvstore.AdjCmd).run(['all'], False, False)
+        output = sys.stdout.getvalue()
+        self.assertIn("node1's adjacencies", output)
+        self.assertIn('node2', output)
+        self.assertEqual(self.client.prefixes, [Consts.ADJ_DB_MARKER])
+
+    def test_snapshot(self):
+        snapshot = self.make_cmd(kvstore.SnapshotCmd).run()
+        self.make_cmd(kvstore.PrefixesCmd).run(['all'], False, snapshot)
+        self.make_cmd(kvstore.AdjCmd).run(['all'], False, False, snapshot)
+        self.make_cmd(kvstore.KeysCmd).run(False, '', True, snapshot)
+        output = sys.stdout.getvalue()
+        self.assertIn('fc00:cafe::/64', output)
+        self.assertIn('node2', output)
+        self.assertIn(Consts.ADJ_DB_MARKER + 'node1', output)
+        # one dump for all the commands, and KeysCmd left its values alone
+        self.assertEqual(self.client.prefixes, [''])
+        for value in snapshot.keyVals.values():
+            self.assertIsNotNone(value.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+
+#
+# Copyright (c) 2014-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import division
+
+from openr.cli.commands import tech_support
+
+import bunch
+import click
+import sys
+import unittest
+
+
+class TestTechSupportCapture(unittest.TestCase):
+    def setUp(self):
+        self.stdout, self.stderr = sys.stdout, sys.stderr
+        sys.stdout = tech_support._ThreadOutput(self.stdout)
+        sys.stderr = tech_support._ThreadOutput(self.stderr)
+
+    def tearDown(self):
+        sys.stdout, sys.stderr = self.stdout, self.stderr
+
+    def test_click_echo(self):
+        def _probe(cli_opts):
+            # like fib validate's PASS/FAIL
+            click.echo('PASS')
+            click.echo(click.style('FAIL', fg='red'), err=True)
+            print('done')
+
+        cmd = tech_support.TechSupportCmd(bunch.Bunch())
+        out, err, error = cmd._run_captured(_probe, bunch.Bunch())
+
+        self.assertIsNone(error)
+        self.assertEqual(''.join(out), 'PASS\ndone\n')
+        self.assertIn('FAIL', ''.join(err))
+
+    def test_failed_probe(self):
+        def _probe(cli_opts):
+            print('partial')
+            raise Exception('timed out')
+
+        cmd = tech_support.TechSupportCmd(bunch.Bunch())
+        out, err, error = cmd._run_captured(_probe, bunch.Bunch())
+
+        self.assertEqual(''.join(out), 'partial\n')
+        self.assertIn('timed out', error)
+
+    def test_exiting_probe(self):
+        def _probe(cli_opts):
+            print('Failed to get routes from Fib.')
+            sys.exit(1)
+
+        cmd = tech_support.TechSupportCmd(bunch.Bunch())
+        out, err, error = cmd._run_captured(_probe, bunch.Bunch())
+
+        self.assertEqual(''.join(out), 'Failed to get routes from Fib.\n')
+        self.assertEqual(error, 'exit status 1')
+
+    def _check_snapshot_failure(self, module, name, get_snapshot, probes):
+        ''' stub module's snapshot cmd name with one failing to fetch, and
+            check get_snapshot fetches once for all the probes
+        '''
+
+        fetches = []
+
+        class SnapshotCmdStub(object):
+            def __init__(self, cli_opts):
+                pass
+
+            def run(self):
+                fetches.append(None)
+                raise Exception('timed out')
+
+        self.addCleanup(setattr, module, name, getattr(module, name))
+        setattr(module, name, SnapshotCmdStub)
+        cmd = tech_support.TechSupportCmd(bunch.Bunch())
+        errors = [cmd._run_captured(get_snapshot(cmd), bunch.Bunch())[2]
+                  for _ in range(probes)]
+
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(errors, [repr(Exception('timed out'))] * probes)
+
+    def test_kvstore_snapshot_failure(self):
+        # nodes, adj, prefixes and keys don't each wait for the dump again
+        self._check_snapshot_failure(
+            tech_support.kvstore, 'SnapshotCmd',
+            lambda cmd: cmd._get_kvstore_snapshot, 4)
+
+    def test_decision_snapshot_failure(self):
+        # decision routes doesn't wait again after decision validate
+        self._check_snapshot_failure(
+            tech_support.decision, 'DecisionSnapshotCmd',
+            lambda cmd: cmd._get_decision_snapshot, 2)
+
+    def _stub_fib(self, name, stub):
+        self.addCleanup(setattr, tech_support.fib, name,
+                        getattr(tech_support.fib, name))
+        setattr(tech_support.fib, name, stub)
+
+    def _stub_fib_cmds(self):
+        ''' stub the fib commands taking the snapshot, recording it '''
+
+        runs = []
+
+        class FibValidateRoutesCmdStub(object):
+            def __init__(self, cli_opts):
+                pass
+
+            def run(self, cli_opts, fib_routes):
+                runs.append(('validate', fib_routes))
+
+        class FibListRoutesCmdStub(object):
+            def __init__(self, cli_opts):
+                pass
+
+            def run(self, prefixes, routes):
+                runs.append(('list', routes))
+
+        self._stub_fib('FibValidateRoutesCmd', FibValidateRoutesCmdStub)
+        self._stub_fib('FibListRoutesCmd', FibListRoutesCmdStub)
+        return runs
+
+    def test_fib_snapshot_failure(self):
+        fetches = []
+        error = Exception('timed out')
+
+        class FibSnapshotCmdStub(object):
+            def __init__(self, cli_opts):
+                pass
+
+            def run(self):
+                fetches.append(None)
+                raise error
+
+        self._stub_fib('FibSnapshotCmd', FibSnapshotCmdStub)
+        runs = self._stub_fib_cmds()
+        cmd = tech_support.TechSupportCmd(bunch.Bunch())
+        cmd._run_captured(cmd.print_fib_validate, bunch.Bunch())
+        cmd._run_captured(cmd.print_fib_list, bunch.Bunch())
+
+        # fetched once, the commands report the error themselves
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(runs, [('validate', error), ('list', error)])
+
+    def test_fib_snapshot_exit(self):
+        connects = []
+
+        class FibSnapshotCmdStub(object):
+            def __init__(self, cli_opts):
+                # like FibAgentCmd failing to connect to the agent
+                connects.append(None)
+                print('Failed to get communicate to Fib.')
+                sys.exit(1)
+
+        self._stub_fib('FibSnapshotCmd', FibSnapshotCmdStub)
+        runs = self._stub_fib_cmds()
+        cmd = tech_support.TechSupportCmd(bunch.Bunch())
+        validate = cmd._run_captured(cmd.print_fib_validate, bunch.Bunch())
+        fib_list = cmd._run_captured(cmd.print_fib_list, bunch.Bunch())
+
+        # no reconnect, the later probe fails without the commands running
+        self.assertEqual(len(connects), 1)
+        self.assertEqual(runs, [])
+        self.assertEqual(''.join(validate[0]),
+                         'Failed to get communicate to Fib.\n')
+        self.assertEqual(fib_list[0], [])
+        self.assertEqual(validate[2], 'exit status 1')
+        self.assertEqual(fib_list[2], 'exit status 1')
+
+    def test_rejects_bytes(self):
+        if bytes is str:
+            # py2, where bytes are text
+            return
+        sys.stdout.capture()
+        try:
+            with self.assertRaises(TypeError):
+                sys.stdout.write(b'')
+        finally:
+            self.assertEqual(sys.stdout.release(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
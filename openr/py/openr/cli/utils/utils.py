@@ -18,6 +18,7 @@ import ipaddr
 import json
 import socket
 import sys
+import threading
 import zmq
 
 from itertools import product
@@ -139,17 +140,79 @@ def get_fib_agent_client(host, port, timeout_ms,
     return client
 
 
+def get_shared_client(cli_opts, client_type, url):
+    '''
+    Get zmq client of client_type connected to url, shared by the commands
+    run with the same cli_opts. zmq sockets are not thread safe, so every
+    thread gets its own client.
+
+    :param cli_opts: cli options, the clients are cached on it
+    :param client_type: client class, e.g. DecisionClient
+    :param url: url of the openr module's command socket
+
+    :returns: The cached client
+    '''
+
+    clients = cli_opts.setdefault('clients', {})
+    key = (threading.current_thread().ident, client_type, url,
+           cli_opts.timeout)
+    client = clients.get(key)
+    if client is None:
+        client = client_type(cli_opts.zmq_ctx, url, cli_opts.timeout,
+                             cli_opts.proto_factory)
+        clients[key] = client
+    return client
+
+
+def clear_shared_clients(cli_opts, current_thread_only=False):
+    '''
+    Close and drop the clients cached on cli_opts and the copies sharing its
+    cache, e.g. after a REQ socket timed out and can no longer send
+
+    :param cli_opts: cli options the clients are cached on
+    :param current_thread_only: only drop the calling thread's clients
+    '''
+
+    clients = cli_opts.get('clients', {})
+    ident = threading.current_thread().ident
+    for key in list(clients):
+        if current_thread_only and key[0] != ident:
+            continue
+        client = clients.pop(key, None)
+        if client is not None:
+            client.close()
+
+
+# (host, lm_cmd_port) -> node name, several commands of e.g. tech-support ask.
+# Cleared by clear_connected_node_names at the end of such a run.
+_connected_node_names = {}
+
+
 def get_connected_node_name(host, lm_cmd_port):
     ''' get the identity of the connected node by querying link monitor'''
 
+    key = (host, lm_cmd_port)
+    node_name = _connected_node_names.get(key)
+    if node_name is not None:
+        return node_name
+
     client = LMClient(
         zmq.Context(),
         'tcp://{}:{}'.format(host, lm_cmd_port))
 
     try:
-        return client.get_identity()
+        node_name = client.get_identity()
     except zmq.error.Again:
         return host
+    _connected_node_names[key] = node_name
+    return node_name
+
+
+def clear_connected_node_names():
+    ''' forget the node names get_connected_node_name looked up, so a later
+        run asks link monitor again '''
+
+    _connected_node_names.clear()
 
 
 def parse_nodes(host, nodes, lm_cmd_port):
@@ -180,8 +243,8 @@ def sprint_prefix(prefix):
     :rtype: str or unicode
     '''
 
-    return '{}/{}'.format(sprint_addr(prefix.prefixAddress.addr),
-                          prefix.prefixLength)
+    return sprint_addr(prefix.prefixAddress.addr) + '/' + \
+        str(prefix.prefixLength)
 
 
 def sprint_prefix_type(prefix_type):
@@ -279,6 +342,7 @@ def print_prefixes_table(resp, nodes, iter_func):
 
     rows = []
     iter_func(rows, resp, nodes, _parse_prefixes)
+    rows.sort(key=lambda row: row[0])
     print(printing.render_vertical_table(rows))
 
 
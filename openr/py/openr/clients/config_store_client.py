@@ -22,6 +22,9 @@ class ConfigStoreClient():
         self._cs_cmd_socket = socket.Socket(zmq_ctx, zmq.REQ, timeout, proto_factory)
         self._cs_cmd_socket.connect(cs_cmd_url)
 
+    def close(self):
+        self._cs_cmd_socket.close()
+
     def _send_req(self, req_msg):
         self._cs_cmd_socket.send_thrift_obj(req_msg)
         return self._cs_cmd_socket.recv_thrift_obj(ps_types.StoreResponse)
@@ -23,6 +23,9 @@ class DecisionClient():
                                                   proto_factory)
         self._decision_cmd_socket.connect(decision_cmd_url)
 
+    def close(self):
+        self._decision_cmd_socket.close()
+
     def _get_db(self, db_type, node_name=''):
 
         req_msg = decision_types.DecisionRequest()
@@ -22,6 +22,9 @@ class FibClient():
         self._fib_cmd_socket = socket.Socket(zmq_ctx, zmq.REQ, timeout, proto_factory)
         self._fib_cmd_socket.connect(fib_cmd_url)
 
+    def close(self):
+        self._fib_cmd_socket.close()
+
     def get_route_db(self):
 
         req_msg = fib_types.FibRequest(fib_types.FibCommand.ROUTE_DB_GET)
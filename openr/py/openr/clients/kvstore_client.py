@@ -23,6 +23,9 @@ class KvStoreClient():
                                                   proto_factory)
         self._kv_store_cmd_socket.connect(kv_store_cmd_url)
 
+    def close(self):
+        self._kv_store_cmd_socket.close()
+
     def get_keys(self, keys):
         ''' Get values corresponding to keys from KvStore.
             It gets from local snapshot KeyVals of the kvstore.
@@ -22,6 +22,9 @@ class LMClient():
         self._lm_cmd_socket = socket.Socket(zmq_ctx, zmq.DEALER, timeout, proto_factory)
         self._lm_cmd_socket.connect(lm_cmd_url)
 
+    def close(self):
+        self._lm_cmd_socket.close()
+
     def dump_links(self, all=True):
         '''
         @param all: If set to false then links with no addresses will be
@@ -23,6 +23,9 @@ class MonitorClient():
                                                   proto_factory)
         self._monitor_cmd_socket.connect(monitor_cmd_url)
 
+    def close(self):
+        self._monitor_cmd_socket.close()
+
     def dump_all_counter_data(self):
 
         request = monitor_types.MonitorRequest()
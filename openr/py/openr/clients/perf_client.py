@@ -22,6 +22,9 @@ class PerfClient():
         self._fib_cmd_socket = socket.Socket(zmq_ctx, zmq.REQ, timeout, proto_factory)
         self._fib_cmd_socket.connect(fib_rep_port)
 
+    def close(self):
+        self._fib_cmd_socket.close()
+
     def view_fib(self):
         req_msg = fib_types.FibRequest(fib_types.FibCommand.PERF_DB_GET)
         self._fib_cmd_socket.send_thrift_obj(req_msg)
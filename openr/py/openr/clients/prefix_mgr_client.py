@@ -25,6 +25,9 @@ class PrefixMgrClient():
                                                     proto_factory)
         self._prefix_mgr_cmd_socket.connect(prefix_mgr_cmd_url)
 
+    def close(self):
+        self._prefix_mgr_cmd_socket.close()
+
     def send_cmd_to_prefix_mgr(self, cmd, prefixes=None,
                                prefix_type='BREEZE'):
         ''' Send the given cmd to prefix manager and return resp '''
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2014-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import division
+
+import binascii
+
+
+def addr_to_int(addr):
+    ''' binary ip addr -> integer '''
+
+    return int(binascii.hexlify(addr), 16)
+
+
+def prefix_mask(prefix_len, width=128):
+    ''' netmask of a prefix as an integer over a width-bit address '''
+
+    return ((1 << width) - 1) ^ ((1 << (width - prefix_len)) - 1)
+
+
+class PrefixTrie(object):
+    ''' Binary trie of ip prefixes for longest prefix match lookups. v4 and v6
+        prefixes are kept apart, keyed on the width of their binary address.
+    '''
+
+    # indices into a trie node, which is a list of [zero, one, value]
+    _ZERO, _ONE, _VALUE = range(3)
+
+    def __init__(self):
+        self._roots = {}
+
+    def insert(self, addr, prefix_len, value):
+        ''' insert value against the prefix addr/prefix_len
+
+            :param addr: binary ip address of the prefix
+            :param prefix_len int: length of the prefix
+            :param value: object to store against the prefix
+
+            :raises ValueError: if the prefix is already present
+        '''
+
+        width = len(addr) * 8
+        addr_int = addr_to_int(addr)
+        node = self._roots.setdefault(width, [None, None, None])
+        for i in range(prefix_len):
+            bit = (addr_int >> (width - 1 - i)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+
+        if node[self._VALUE] is not None:
+            raise ValueError('Duplicate prefix')
+        node[self._VALUE] = value
+
+    def search_best(self, addr):
+        ''' find the value of the longest prefix containing addr
+
+            :param addr: binary ip address to look up
+
+            :return: the stored value or None if no prefix contains addr
+        '''
+
+        width = len(addr) * 8
+        node = self._roots.get(width)
+        if node is None:
+            return None
+
+        addr_int = addr_to_int(addr)
+        best = node[self._VALUE]
+        for i in range(width):
+            node = node[(addr_int >> (width - 1 - i)) & 1]
+            if node is None:
+                break
+            if node[self._VALUE] is not None:
+                best = node[self._VALUE]
+        return best
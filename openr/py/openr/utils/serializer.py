@@ -10,6 +10,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 
+import copy
+
 from thrift.util import Serializer
 
 from openr.utils.consts import Consts
@@ -41,3 +43,30 @@ def deserialize_thrift_object(raw_data, thrift_type,
     resp = thrift_type()
     Serializer.deserialize(proto_factory(), raw_data, resp)
     return resp
+
+
+# (thrift type, serialized payload) -> deserialized object
+_DESERIALIZE_CACHE_SIZE = 1024
+_deserialize_cache = {}
+
+
+def deserialize_thrift_object_cached(raw_data, thrift_type,
+                                     proto_factory=Consts.PROTO_FACTORY):
+    ''' Deserialize thrift data from binary blob, reusing the result for
+        payloads already seen in this process
+
+        :param raw_data string: the serialized thrift payload
+        :param thrift_type: the thrift type
+        :param proto_factory: protocol factory, set default as Compact Protocol
+
+        :return: shallow copy of the cached instance of thrift_type
+    '''
+
+    key = (thrift_type, proto_factory, raw_data)
+    obj = _deserialize_cache.get(key)
+    if obj is None:
+        if len(_deserialize_cache) >= _DESERIALIZE_CACHE_SIZE:
+            _deserialize_cache.clear()
+        obj = deserialize_thrift_object(raw_data, thrift_type, proto_factory)
+        _deserialize_cache[key] = obj
+    return copy.copy(obj)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+#
+# Copyright (c) 2014-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import division
+
+import socket
+import unittest
+
+from openr.utils.prefix_trie import PrefixTrie, addr_to_int, prefix_mask
+
+
+def v6(addr_str):
+    return socket.inet_pton(socket.AF_INET6, addr_str)
+
+
+def v4(addr_str):
+    return socket.inet_pton(socket.AF_INET, addr_str)
+
+
+class TestPrefixTrie(unittest.TestCase):
+    def test_addr_to_int(self):
+        self.assertEqual(addr_to_int(v4('10.0.0.1')), 0x0a000001)
+        self.assertEqual(addr_to_int(v6('::1')), 1)
+
+    def test_prefix_mask(self):
+        self.assertEqual(prefix_mask(0), 0)
+        self.assertEqual(prefix_mask(128), (1 << 128) - 1)
+        self.assertEqual(prefix_mask(24, 32), 0xffffff00)
+        self.assertEqual(
+            addr_to_int(v6('fc00:cafe:babe::1')) & prefix_mask(32),
+            addr_to_int(v6('fc00:cafe::')))
+
+    def test_longest_prefix_match(self):
+        trie = PrefixTrie()
+        trie.insert(v6('::'), 0, 'default')
+        trie.insert(v6('fc00:cafe::'), 32, 'short')
+        trie.insert(v6('fc00:cafe:babe::'), 48, 'long')
+
+        self.assertEqual(trie.search_best(v6('fc00:cafe:babe::1')), 'long')
+        self.assertEqual(trie.search_best(v6('fc00:cafe:beef::1')), 'short')
+        self.assertEqual(trie.search_best(v6('2001:db8::1')), 'default')
+
+    def test_no_match(self):
+        trie = PrefixTrie()
+        self.assertIsNone(trie.search_best(v6('fc00::1')))
+
+        trie.insert(v6('fc00:cafe::'), 32, 'v6')
+        self.assertIsNone(trie.search_best(v6('fc00:beef::1')))
+
+    def test_address_families_are_separate(self):
+        trie = PrefixTrie()
+        trie.insert(v4('0.0.0.0'), 0, 'v4-default')
+        self.assertIsNone(trie.search_best(v6('fc00::1')))
+        self.assertEqual(trie.search_best(v4('10.1.1.1')), 'v4-default')
+
+    def test_duplicate_prefix(self):
+        trie = PrefixTrie()
+        trie.insert(v6('fc00:cafe::'), 32, 'a')
+        with self.assertRaises(ValueError):
+            trie.insert(v6('fc00:cafe::'), 32, 'b')
@@ -59,3 +59,16 @@ class TestSerialization(unittest.TestCase):
         with self.assertRaises(Exception):
             serializer.deserialize_thrift_object(
                 raw_msg, lsdb_types.PrefixDatabase, TJSONProtocolFactory)
+
+    def test_cached_deserialization(self):
+        thrift_obj = lsdb_types.PrefixDatabase()
+        thrift_obj.thisNodeName = "some node"
+        raw_msg = serializer.serialize_thrift_object(thrift_obj)
+        first_obj = serializer.deserialize_thrift_object_cached(
+            raw_msg, lsdb_types.PrefixDatabase)
+        second_obj = serializer.deserialize_thrift_object_cached(
+            raw_msg, lsdb_types.PrefixDatabase)
+        self.assertEqual(thrift_obj, first_obj)
+        self.assertEqual(first_obj, second_obj)
+        # callers get their own copies
+        self.assertIsNot(first_obj, second_obj)